@@ -12,13 +12,32 @@ The application enables foreign‑key support for SQLite and
 configures cascade behaviour on foreign keys so that deleting a
 parent record automatically deletes dependent records; SQLite
 implements this behaviour via the `ON DELETE CASCADE` clause【685663684588476†L559-L563】.
+
+Session and connection lifecycle: Flask‑SQLAlchemy scopes the session to
+the application context and removes it on teardown, and the pool keeps a
+single warm connection (see `SQLALCHEMY_ENGINE_OPTIONS`), so a request
+reuses an already-configured physical connection — the PRAGMAs in
+`_configurar_sqlite` run only when the pool opens a new one, not per
+request. A `StaticPool` would pin one connection for the whole process,
+but it hands the same DBAPI connection to concurrent threads, which is
+unsafe for a file-backed database under a threaded server; the size-one
+`QueuePool` gives the same warm-connection behaviour with checkout
+serialization.
 """
 
+import os
+
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from jinja2 import FileSystemBytecodeCache
 
 db = SQLAlchemy()
 
+# Versão corrente do schema, gravada no PRAGMA user_version do arquivo.
+# Incrementar sempre que _ensure_schema ganhar novas colunas ou índices,
+# para que bases existentes migrem no próximo boot.
+SCHEMA_VERSION = 2
+
 
 def create_app():
     """Factory function to create and configure the Flask app."""
@@ -28,17 +47,39 @@ def create_app():
     # SQLite database file. The database will be created automatically.
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///regua_comunicacao.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Pool pequeno condizente com o modelo de escritor único do SQLite: uma
+    # conexão quente reaproveitada entre requisições, com pouco overflow para
+    # picos, em vez de um enxame de conexões disputando a trava de escrita.
+    # O timeout do driver espelha o busy_timeout definido nos PRAGMAs.
+    # pool_pre_ping e pool_recycle ficam de fora de propósito: servem para
+    # detectar conexões de rede derrubadas por um servidor remoto, situação
+    # que não existe com um arquivo local — seriam um round-trip extra por
+    # checkout sem nada a detectar. A devolução da sessão ao fim de cada
+    # requisição já é feita pelo teardown do Flask-SQLAlchemy.
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 1,
+        'max_overflow': 4,
+        'connect_args': {'timeout': 5, 'check_same_thread': False},
+    }
+
+    # Cache de bytecode do Jinja: o resultado da compilação dos templates
+    # sobrevive a reinícios de worker, então cada template é compilado uma
+    # vez por deploy em vez de uma vez por processo. O auto_reload padrão do
+    # Flask (ligado em debug) continua valendo porque a opção é aplicada na
+    # criação preguiçosa do ambiente — fora do debug não há stat() de
+    # template por requisição. O cache em memória de templates compilados
+    # (cache_size, padrão 400) já comporta com folga os poucos templates da
+    # aplicação, então nenhum template é recompilado dentro de um processo.
+    cache_templates = os.path.join(app.instance_path, 'jinja_cache')
+    os.makedirs(cache_templates, exist_ok=True)
+    app.jinja_options = {
+        **app.jinja_options,
+        'bytecode_cache': FileSystemBytecodeCache(cache_templates),
+    }
 
     # Initialise database
     db.init_app(app)
 
-    # Enable SQLite foreign key enforcement each time a connection is created.
-    # Without this pragma SQLite ignores foreign keys by default.【685663684588476†L559-L563】
-    @app.before_request
-    def before_request():
-        from sqlalchemy import text
-        db.session.execute(text('PRAGMA foreign_keys = ON'))
-
     # Import models so that they are registered with SQLAlchemy
     from . import models  # noqa: F401
 
@@ -46,20 +87,85 @@ def create_app():
     from .routes import bp as routes_bp  # noqa: F401
     app.register_blueprint(routes_bp)
 
-    # Create database tables if they do not exist
     with app.app_context():
-        db.create_all()
-        _ensure_schema()
+        _configurar_sqlite(db.engine)
+        _migrar_se_necessario()
+        # Semeia a regra padrão uma única vez por processo, fora do caminho
+        # quente das requisições.
+        from .routes import ensure_regra_padrao
+        ensure_regra_padrao()
+
+    @app.cli.command('init-schema')
+    def init_schema() -> None:
+        """Força a criação das tabelas e a migração incremental do schema."""
+        _inicializar_schema()
 
     return app
 
 
+def _migrar_se_necessario() -> None:
+    """Roda a migração apenas quando o PRAGMA user_version está atrasado.
+
+    Com isso, boots subsequentes (cada worker WSGI importa a app) custam uma
+    única leitura de inteiro em vez de recriar tabelas, sondar colunas e
+    reescrever snapshots a cada inicialização. ``flask init-schema`` permite
+    forçar a migração manualmente.
+    """
+
+    from sqlalchemy import text
+
+    versao = db.session.execute(text('PRAGMA user_version')).scalar()
+    if versao < SCHEMA_VERSION:
+        _inicializar_schema()
+
+
+def _inicializar_schema() -> None:
+    """Cria as tabelas, aplica a migração incremental e marca a versão."""
+
+    from sqlalchemy import text
+
+    db.create_all()
+    _ensure_schema()
+    db.session.execute(text(f'PRAGMA user_version = {SCHEMA_VERSION}'))
+    db.session.commit()
+
+
+def _configurar_sqlite(engine) -> None:
+    """Registra PRAGMAs de sessão executados uma única vez por conexão física.
+
+    Enforcar chaves estrangeiras por conexão é obrigatório no SQLite, que as
+    ignora por padrão【685663684588476†L559-L563】. Fazer isso num listener de
+    ``connect`` evita emitir o PRAGMA a cada requisição HTTP.
+
+    Também ativa o modo WAL, que permite leituras concorrentes com escrita e
+    barateia commits (menos fsyncs que o rollback journal padrão). O modo de
+    journal é uma propriedade durável do arquivo, mas o PRAGMA é idempotente,
+    então é seguro reexecutá-lo a cada conexão.
+    """
+
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'connect')
+    def _definir_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.execute('PRAGMA journal_mode=WAL')
+        # Com WAL, synchronous=NORMAL mantém integridade do banco e só
+        # arrisca durabilidade do último commit em queda de energia.
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        # Espera até 5s por locks antes de devolver SQLITE_BUSY.
+        cursor.execute('PRAGMA busy_timeout=5000')
+        # Cache de páginas de ~20 MB e tabelas temporárias em memória reduzem
+        # I/O nas consultas de listagem.
+        cursor.execute('PRAGMA cache_size=-20000')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+
 def _ensure_schema() -> None:
     """Garante colunas adicionadas em versões posteriores sem precisar de migração."""
 
     from sqlalchemy import text
-    from sqlalchemy.orm import selectinload
-    from .models import DiaComunicacao, TemaRegra, Tema
 
     engine = db.get_engine()
 
@@ -78,47 +184,47 @@ def _ensure_schema() -> None:
     if not coluna_existe('dias_comunicacoes', 'jornada_nome'):
         alter_statements.append("ALTER TABLE dias_comunicacoes ADD COLUMN jornada_nome VARCHAR(120)")
 
-    if alter_statements:
-        with engine.begin() as conn:
-            for comando in alter_statements:
-                conn.execute(text(comando))
-
-    dias = (
-        DiaComunicacao.query.options(
-            selectinload(DiaComunicacao.tema_regra)
-            .selectinload(TemaRegra.tema)
-            .selectinload(Tema.jornada),
-            selectinload(DiaComunicacao.tema_regra).selectinload(TemaRegra.alternativa),
-            selectinload(DiaComunicacao.tema_regra).selectinload(TemaRegra.regra),
-        ).all()
+    # Índices novos precisam ser criados aqui também: create_all ignora
+    # tabelas que já existem, então bases antigas não os ganhariam.
+    alter_statements.append(
+        "CREATE INDEX IF NOT EXISTS ix_dias_dia_tr ON dias_comunicacoes (dia, tema_regra_id)"
     )
-    alterado = False
-    for dia in dias:
-        tema_regra = dia.tema_regra
-        tema = tema_regra.tema if tema_regra else None
-        if tema:
-            if dia.tema_id != tema.id:
-                dia.tema_id = tema.id
-                alterado = True
-            if dia.tema_nome != (tema.nome or dia.tema_nome):
-                dia.tema_nome = tema.nome or dia.tema_nome
-                alterado = True
-            jornada = tema.jornada
-            jornada_id = jornada.id if jornada else None
-            jornada_nome = jornada.nome if jornada else None
-            if dia.jornada_id != jornada_id or dia.jornada_nome != jornada_nome:
-                dia.jornada_id = jornada_id
-                dia.jornada_nome = jornada_nome
-                alterado = True
-        if tema_regra:
-            alternativa = tema_regra.alternativa
-            alt_tema_id = alternativa.tema_id if alternativa else None
-            if dia.tema_id_alternativo != alt_tema_id:
-                dia.tema_id_alternativo = alt_tema_id
-                alterado = True
-            if dia.regra_id != tema_regra.regra_id:
-                dia.regra_id = tema_regra.regra_id
-                alterado = True
-
-    if alterado:
-        db.session.commit()
+    alter_statements.append(
+        "CREATE INDEX IF NOT EXISTS ix_tr_tema_regra ON temas_regras (tema_id, regra_id)"
+    )
+    alter_statements.append(
+        "CREATE INDEX IF NOT EXISTS ix_temas_nome ON temas (nome)"
+    )
+
+    # Uma única transação cobre os ALTERs e a correção das linhas. BEGIN
+    # IMMEDIATE adquire a trava de escrita já no início, em vez de promover
+    # a trava no meio da migração (o caminho que gera SQLITE_BUSY).
+    db.session.execute(text('BEGIN IMMEDIATE'))
+    for comando in alter_statements:
+        db.session.execute(text(comando))
+
+    # Um único UPDATE ... FROM (SQLite >= 3.33) realinha as colunas
+    # desnormalizadas de todos os dias de uma vez, em vez de carregar cada
+    # DiaComunicacao pelo ORM e emitir um UPDATE por linha alterada.
+    db.session.execute(
+        text(
+            """
+            UPDATE dias_comunicacoes AS d
+            SET tema_id = tr.tema_id,
+                tema_nome = COALESCE(t.nome, d.tema_nome),
+                regra_id = tr.regra_id,
+                tema_id_alternativo = alt.tema_id,
+                jornada_id = t.jornada_id,
+                jornada_nome = j.nome
+            FROM temas_regras AS tr
+            LEFT JOIN temas AS t ON t.id = tr.tema_id
+            LEFT JOIN jornadas AS j ON j.id = t.jornada_id
+            LEFT JOIN temas_regras AS alt ON alt.id = tr.alternativa_id
+            WHERE tr.id = d.tema_regra_id
+            """
+        )
+    )
+
+    # O commit encerra a transação aberta pelo BEGIN IMMEDIATE mesmo quando
+    # nenhuma linha foi alterada.
+    db.session.commit()
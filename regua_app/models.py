@@ -31,6 +31,9 @@ class Jornada(db.Model):
 
 class Tema(db.Model):
     __tablename__ = 'temas'
+    # As listagens e os dropdowns ordenam sempre por nome; o índice evita o
+    # B-tree temporário de ordenação a cada consulta.
+    __table_args__ = (db.Index('ix_temas_nome', 'nome'),)
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(100), nullable=False)
     descricao = db.Column(db.Text, nullable=True)
@@ -48,8 +51,28 @@ class Tema(db.Model):
 
     # Relationship to the alternative theme. Use remote_side so SQLAlchemy can
     # distinguish between the parent and child in a self‑referential relationship.
-    alternativo = db.relationship('Tema', remote_side=[id], backref='variacoes')
+    alternativo = db.relationship(
+        'Tema',
+        remote_side=[id],
+        foreign_keys=[id_alternativo],
+        back_populates='variacoes',
+    )
+    variacoes = db.relationship(
+        'Tema',
+        foreign_keys=[id_alternativo],
+        back_populates='alternativo',
+    )
     jornada = db.relationship('Jornada', back_populates='temas')
+    tema_regras = db.relationship(
+        'TemaRegra',
+        foreign_keys='TemaRegra.tema_id',
+        back_populates='tema',
+    )
+    tema_regra_alternativas = db.relationship(
+        'TemaRegra',
+        foreign_keys='TemaRegra.tema_id_alternativo',
+        back_populates='tema_alternativo',
+    )
 
     def __repr__(self):
         return f"<Tema {self.id}: {self.nome}>"
@@ -60,12 +83,20 @@ class Regra(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     descricao = db.Column(db.Text, nullable=False)
 
+    tema_regras = db.relationship(
+        'TemaRegra',
+        foreign_keys='TemaRegra.regra_id',
+        back_populates='regra',
+    )
+
     def __repr__(self):
         return f"<Regra {self.id}>"
 
 
 class TemaRegra(db.Model):
     __tablename__ = 'temas_regras'
+    # Acelera os JOINs tema/regra feitos pelo gerador de diagrama.
+    __table_args__ = (db.Index('ix_tr_tema_regra', 'tema_id', 'regra_id'),)
     id = db.Column(db.Integer, primary_key=True)
     tema_id = db.Column(
         db.Integer,
@@ -88,17 +119,39 @@ class TemaRegra(db.Model):
         nullable=True,
     )
 
-    tema = db.relationship('Tema', foreign_keys=[tema_id], backref='tema_regras')
-    regra = db.relationship('Regra', foreign_keys=[regra_id], backref='tema_regras')
+    # lazy='joined' nas pontas de cardinalidade 1: um unico JOIN traz tema,
+    # regra e tema alternativo junto com o vinculo, evitando round-trips
+    # extras quando templates ou o gerador de diagrama navegam por eles.
+    tema = db.relationship(
+        'Tema',
+        foreign_keys=[tema_id],
+        back_populates='tema_regras',
+        lazy='joined',
+    )
+    regra = db.relationship(
+        'Regra',
+        foreign_keys=[regra_id],
+        back_populates='tema_regras',
+        lazy='joined',
+    )
     tema_alternativo = db.relationship(
-        'Tema', foreign_keys=[tema_id_alternativo], backref='tema_regra_alternativas'
+        'Tema',
+        foreign_keys=[tema_id_alternativo],
+        back_populates='tema_regra_alternativas',
+        lazy='joined',
     )
     alternativa = db.relationship(
         'TemaRegra',
         remote_side=[id],
-        backref='variacoes',
         foreign_keys=[alternativa_id],
+        back_populates='variacoes',
+    )
+    variacoes = db.relationship(
+        'TemaRegra',
+        foreign_keys=[alternativa_id],
+        back_populates='alternativa',
     )
+    dias = db.relationship('DiaComunicacao', back_populates='tema_regra')
 
     def __repr__(self):
         return f"<TemaRegra {self.id}: Tema {self.tema_id} – Regra {self.regra_id}>"
@@ -106,6 +159,9 @@ class TemaRegra(db.Model):
 
 class DiaComunicacao(db.Model):
     __tablename__ = 'dias_comunicacoes'
+    # Permite que o ORDER BY dia das listagens e do diagrama leia direto do
+    # índice em vez de varrer a tabela e ordenar num B-tree temporário.
+    __table_args__ = (db.Index('ix_dias_dia_tr', 'dia', 'tema_regra_id'),)
     id = db.Column(db.Integer, primary_key=True)
     dia = db.Column(db.Integer, nullable=False)  # Valor maior ou igual a zero
     tema_regra_id = db.Column(
@@ -114,7 +170,7 @@ class DiaComunicacao(db.Model):
         nullable=False,
     )
 
-    tema_regra = db.relationship('TemaRegra', backref='dias')
+    tema_regra = db.relationship('TemaRegra', back_populates='dias')
 
     # ... dentro de class DiaComunicacao(db.Model):
     tema_id = db.Column(db.Integer, nullable=False)
@@ -15,66 +15,74 @@ edges are defined using the `Digraph` class and rendered to a PNG
 file【326654681106756†L246-L266】.
 """
 
+import hashlib
+from itertools import groupby
+
 from flask import (
     Blueprint,
+    abort,
+    current_app,
+    make_response,
     render_template,
     request,
     redirect,
     url_for,
     flash,
-    Response
+    Response,
+    stream_with_context,
 )
 from . import db
 from .models import Jornada, Tema, Regra, TemaRegra, DiaComunicacao
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.orm import raiseload, selectinload
 
 
 bp = Blueprint('routes', __name__)
 
 
-def ensure_regra_padrao() -> None:
-    """Garante que a regra padrão "Sem Regra" exista na base de dados."""
-    if not Regra.query.filter_by(descricao='Sem Regra').first():
-        regra_padrao = Regra(descricao='Sem Regra')
-        db.session.add(regra_padrao)
-        db.session.commit()
+def _get_or_404(model, ident):
+    """Busca por chave primária via ``Session.get`` ou aborta com 404.
 
+    ``Session.get`` consulta o identity map antes de ir ao banco, então um
+    registro já carregado na requisição não gera SQL adicional — ao contrário
+    do caminho legado ``Query.get_or_404``.
+    """
 
-def _limpar_dependencias_tema_regra(tema_regra: TemaRegra) -> None:
-    """Remove dependências de um registro de TemaRegra antes da exclusão."""
-
-    # Remove os dias associados diretamente a este vínculo.
-    for dia in list(tema_regra.dias):
-        db.session.delete(dia)
-
-    # Zera a referência de registros que apontam para este vínculo como alternativa.
-    for dependente in TemaRegra.query.filter_by(alternativa_id=tema_regra.id).all():
-        dependente.alternativa_id = None
+    obj = db.session.get(model, ident)
+    if obj is None:
+        abort(404)
+    return obj
 
 
-def _limpar_dependencias_tema(tema: Tema) -> None:
-    """Remove relações e dias de comunicação vinculados a um tema."""
+# A regra padrão é verificada uma vez por processo (no boot, em create_app);
+# depois disso o flag evita repetir o SELECT a cada requisição.
+_regra_padrao_ok = False
 
-    # Remove vínculos (e seus dias) em que o tema é o principal.
-    for tema_regra in list(tema.tema_regras):
-        _limpar_dependencias_tema_regra(tema_regra)
-        db.session.delete(tema_regra)
 
-    # Desassocia vínculos onde o tema é usado como alternativa.
-    for dependente in TemaRegra.query.filter_by(tema_id_alternativo=tema.id).all():
-        dependente.tema_id_alternativo = None
+def ensure_regra_padrao() -> None:
+    """Garante que a regra padrão "Sem Regra" exista na base de dados."""
+    global _regra_padrao_ok
+    if _regra_padrao_ok:
+        return
+    if not Regra.query.filter_by(descricao='Sem Regra').first():
+        regra_padrao = Regra(descricao='Sem Regra')
+        db.session.add(regra_padrao)
+        db.session.commit()
+    _regra_padrao_ok = True
 
-    # Desassocia variações que apontam para este tema.
-    for variacao in list(tema.variacoes):
-        variacao.id_alternativo = None
 
+def _deletar_ou_404(model, ident) -> None:
+    """Emite um único DELETE pela chave primária ou aborta com 404.
 
-def _limpar_dependencias_regra(regra: Regra) -> None:
-    """Remove vínculos e dias associados a uma regra."""
+    As chaves estrangeiras já declaram ON DELETE CASCADE/SET NULL e o PRAGMA
+    foreign_keys está ativo, então o banco propaga a exclusão sozinho — não é
+    preciso carregar cada dependente pelo ORM para deletá-lo linha a linha.
+    """
 
-    for tema_regra in list(regra.tema_regras):
-        _limpar_dependencias_tema_regra(tema_regra)
-        db.session.delete(tema_regra)
+    resultado = db.session.execute(delete(model).where(model.id == ident))
+    if resultado.rowcount == 0:
+        db.session.rollback()
+        abort(404)
 
 
 def _obter_jornada_info(tema: Tema | None) -> tuple[int | None, str | None]:
@@ -85,7 +93,7 @@ def _obter_jornada_info(tema: Tema | None) -> tuple[int | None, str | None]:
 
     jornada = getattr(tema, 'jornada', None)
     if not jornada and tema.jornada_id:
-        jornada = Jornada.query.get(tema.jornada_id)
+        jornada = db.session.get(Jornada, tema.jornada_id)
     if jornada:
         return jornada.id, jornada.nome
     return None, None
@@ -97,7 +105,7 @@ def _atualizar_dias_para_tema(tema: Tema, jornada: Jornada | None = None) -> Non
     if jornada is None:
         jornada = getattr(tema, 'jornada', None)
         if jornada is None and tema.jornada_id:
-            jornada = Jornada.query.get(tema.jornada_id)
+            jornada = db.session.get(Jornada, tema.jornada_id)
 
     jornada_id = jornada.id if jornada else None
     jornada_nome = jornada.nome if jornada else None
@@ -122,51 +130,55 @@ def _preencher_dia_por_tema_regra(dia: DiaComunicacao, tema_regra: TemaRegra) ->
     dia.jornada_nome = jornada_nome
 
 
-def _desassociar_jornada(jornada: Jornada) -> None:
-    """Remove a associação dos temas vinculados a uma jornada antes da exclusão."""
-
-    for tema in list(jornada.temas):
-        tema.jornada = None
-        _atualizar_dias_para_tema(tema, jornada=None)
-
-
 @bp.route('/')
 def home():
     """Home page showing lists of all existing records and options to add new."""
-    ensure_regra_padrao()
+    # Em modo debug, qualquer acesso a relacionamento não pré-carregado vira
+    # exceção em vez de uma query extra silenciosa — protege contra
+    # regressões de N+1 quando o template passa a navegar por novos campos.
+    guarda_n1 = [raiseload('*', sql_only=True)] if current_app.debug else []
+    # Limita as listas que crescem com o uso (vínculos e dias); ?limit=N
+    # permite ampliar a janela quando necessário. Temas, regras e jornadas
+    # são dados de referência pequenos e continuam completos — é deles que o
+    # identity map resolve as pontas muitos-para-um sem SQL.
+    limite = request.args.get('limit', 200, type=int)
     temas = (
-        Tema.query.options(selectinload(Tema.jornada))
+        Tema.query.options(selectinload(Tema.jornada), *guarda_n1)
         .order_by(Tema.nome)
         .all()
     )
     regras = Regra.query.order_by(Regra.descricao).all()
+    # As duas consultas acima já colocam todos os temas (com jornada) e regras
+    # no identity map, então as pontas muitos-para-um dos vínculos e dos dias
+    # resolvem em memória, sem SQL — os encadeamentos aninhados de
+    # selectinload que repetiam tema/jornada/regra por nível são dispensáveis.
     temas_regras = (
-        TemaRegra.query.options(
-            selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-            selectinload(TemaRegra.regra),
-            selectinload(TemaRegra.alternativa)
-            .selectinload(TemaRegra.tema)
-            .selectinload(Tema.jornada),
-            selectinload(TemaRegra.alternativa).selectinload(TemaRegra.regra),
-        )
+        TemaRegra.query.options(selectinload(TemaRegra.alternativa), *guarda_n1)
         .order_by(TemaRegra.id)
+        .limit(limite)
         .all()
     )
     dias = (
         DiaComunicacao.query.options(
-            selectinload(DiaComunicacao.tema_regra)
-            .selectinload(TemaRegra.tema)
-            .selectinload(Tema.jornada),
-            selectinload(DiaComunicacao.tema_regra).selectinload(TemaRegra.regra),
+            selectinload(DiaComunicacao.tema_regra), *guarda_n1
         )
         .order_by(DiaComunicacao.dia, DiaComunicacao.id)
+        .limit(limite)
         .all()
     )
     jornadas = (
-        Jornada.query.options(selectinload(Jornada.temas))
+        Jornada.query.options(selectinload(Jornada.temas), *guarda_n1)
         .order_by(Jornada.nome)
         .all()
     )
+    # Totais reais das listas limitadas, para o template indicar truncamento
+    # e oferecer o link "mostrar todos" — uma consulta só para os dois.
+    total_vinculos, total_dias = db.session.execute(
+        select(
+            select(func.count(TemaRegra.id)).scalar_subquery(),
+            select(func.count(DiaComunicacao.id)).scalar_subquery(),
+        )
+    ).one()
     return render_template(
         'home.html',
         temas=temas,
@@ -174,6 +186,9 @@ def home():
         temas_regras=temas_regras,
         dias=dias,
         jornadas=jornadas,
+        total_vinculos=total_vinculos,
+        total_dias=total_dias,
+        limite_tudo=max(total_vinculos, total_dias),
     )
 
 
@@ -193,6 +208,7 @@ def novo_tema():
         )
         db.session.add(tema)
         db.session.commit()
+        _invalidar_caches()
         flash('Tema criado com sucesso!')
         return redirect(url_for('routes.home'))
 
@@ -208,16 +224,17 @@ def novo_tema():
 @bp.route('/tema/<int:tema_id>/editar', methods=['GET', 'POST'])
 def editar_tema(tema_id):
     """Edit an existing Tema."""
-    tema = Tema.query.get_or_404(tema_id)
+    tema = _get_or_404(Tema, tema_id)
     if request.method == 'POST':
         tema.nome = request.form.get('nome')
         tema.descricao = request.form.get('descricao')
         tema.objetivo = request.form.get('objetivo')
         jornada_id = request.form.get('jornada_id') or None
-        tema.jornada = Jornada.query.get(int(jornada_id)) if jornada_id else None
+        tema.jornada = db.session.get(Jornada, int(jornada_id)) if jornada_id else None
         db.session.flush()
         _atualizar_dias_para_tema(tema)
         db.session.commit()
+        _invalidar_caches()
         flash('Tema atualizado com sucesso!')
         return redirect(url_for('routes.home'))
     temas = (
@@ -232,10 +249,9 @@ def editar_tema(tema_id):
 @bp.route('/tema/<int:tema_id>/deletar', methods=['POST'])
 def deletar_tema(tema_id):
     """Delete a Tema and cascade delete related records."""
-    tema = Tema.query.get_or_404(tema_id)
-    _limpar_dependencias_tema(tema)
-    db.session.delete(tema)
+    _deletar_ou_404(Tema, tema_id)
     db.session.commit()
+    _invalidar_caches()
     flash('Tema deletado com sucesso!')
     return redirect(url_for('routes.home'))
 
@@ -243,12 +259,12 @@ def deletar_tema(tema_id):
 @bp.route('/regra/novo', methods=['GET', 'POST'])
 def novo_regra():
     """Create a new Regra."""
-    ensure_regra_padrao()
     if request.method == 'POST':
         descricao = request.form.get('descricao')
         regra = Regra(descricao=descricao)
         db.session.add(regra)
         db.session.commit()
+        _invalidar_caches()
         flash('Regra criada com sucesso!')
         return redirect(url_for('routes.home'))
     regras = Regra.query.order_by(Regra.descricao).all()
@@ -258,11 +274,11 @@ def novo_regra():
 @bp.route('/regra/<int:regra_id>/editar', methods=['GET', 'POST'])
 def editar_regra(regra_id):
     """Edit a Regra."""
-    regra = Regra.query.get_or_404(regra_id)
-    ensure_regra_padrao()
+    regra = _get_or_404(Regra, regra_id)
     if request.method == 'POST':
         regra.descricao = request.form.get('descricao')
         db.session.commit()
+        _invalidar_caches()
         flash('Regra atualizada com sucesso!')
         return redirect(url_for('routes.home'))
     regras = Regra.query.order_by(Regra.descricao).all()
@@ -272,10 +288,9 @@ def editar_regra(regra_id):
 @bp.route('/regra/<int:regra_id>/deletar', methods=['POST'])
 def deletar_regra(regra_id):
     """Delete a Regra and cascade delete related TemaRegra and Dias."""
-    regra = Regra.query.get_or_404(regra_id)
-    _limpar_dependencias_regra(regra)
-    db.session.delete(regra)
+    _deletar_ou_404(Regra, regra_id)
     db.session.commit()
+    _invalidar_caches()
     flash('Regra deletada com sucesso!')
     return redirect(url_for('routes.home'))
 
@@ -290,6 +305,7 @@ def nova_jornada():
         jornada = Jornada(nome=nome, descricao=descricao)
         db.session.add(jornada)
         db.session.commit()
+        _invalidar_caches()
         flash('Jornada criada com sucesso!')
         return redirect(url_for('routes.home'))
 
@@ -305,13 +321,14 @@ def nova_jornada():
 def editar_jornada(jornada_id):
     """Atualiza dados de uma jornada existente."""
 
-    jornada = Jornada.query.get_or_404(jornada_id)
+    jornada = _get_or_404(Jornada, jornada_id)
     if request.method == 'POST':
         jornada.nome = request.form.get('nome')
         jornada.descricao = request.form.get('descricao')
         for tema in jornada.temas:
             _atualizar_dias_para_tema(tema, jornada)
         db.session.commit()
+        _invalidar_caches()
         flash('Jornada atualizada com sucesso!')
         return redirect(url_for('routes.home'))
 
@@ -327,23 +344,32 @@ def editar_jornada(jornada_id):
 def deletar_jornada(jornada_id):
     """Remove uma jornada e desassocia os temas vinculados."""
 
-    jornada = Jornada.query.get_or_404(jornada_id)
-    _desassociar_jornada(jornada)
-    db.session.delete(jornada)
+    _deletar_ou_404(Jornada, jornada_id)
+    # As colunas de snapshot dos dias não são chaves estrangeiras, então o
+    # banco não as limpa em cascata; um único UPDATE desassocia todos os dias.
+    db.session.execute(
+        text(
+            'UPDATE dias_comunicacoes SET jornada_id = NULL, jornada_nome = NULL '
+            'WHERE jornada_id = :id'
+        ),
+        {'id': jornada_id},
+    )
     db.session.commit()
+    _invalidar_caches()
     flash('Jornada deletada com sucesso!')
     return redirect(url_for('routes.home'))
 
 
-@bp.route('/tema_regra/novo', methods=['GET', 'POST'])
-def novo_tema_regra():
-    """Create a new TemaRegra linking a Tema and a Regra."""
-    temas = (
-        Tema.query.options(selectinload(Tema.jornada))
-        .order_by(Tema.nome)
-        .all()
-    )
-    regras = Regra.query.order_by(Regra.descricao).all()
+def _carregar_opcoes_tema_regra():
+    """Carrega as listas compartilhadas pelos formulários de vínculo Tema–Regra.
+
+    As duas rotas de formulário precisam exatamente dos mesmos dados. Os
+    dropdowns de tema e regra saem dos caches de linhas leves; só a lista de
+    vínculos é hidratada pelo ORM (o formulário navega pelos relacionamentos).
+    """
+
+    temas = _opcoes_temas_dropdown()
+    regras = _opcoes_regras_dropdown()
     tema_regra_lista = (
         TemaRegra.query.options(
             selectinload(TemaRegra.tema).selectinload(Tema.jornada),
@@ -356,6 +382,13 @@ def novo_tema_regra():
         .order_by(TemaRegra.id)
         .all()
     )
+    return temas, regras, tema_regra_lista
+
+
+@bp.route('/tema_regra/novo', methods=['GET', 'POST'])
+def novo_tema_regra():
+    """Create a new TemaRegra linking a Tema and a Regra."""
+    temas, regras, tema_regra_lista = _carregar_opcoes_tema_regra()
     preselected_tema_id = request.args.get('tema_id', type=int)
     if request.method == 'POST':
         tema_id = int(request.form.get('tema_id'))
@@ -368,6 +401,7 @@ def novo_tema_regra():
         )
         db.session.add(tr)
         db.session.commit()
+        _invalidar_caches()
         flash('Vínculo Tema–Regra criado com sucesso!')
         return redirect(url_for('routes.home'))
     return render_template(
@@ -384,61 +418,32 @@ def novo_tema_regra():
 @bp.route('/tema_regra/<int:tr_id>/editar', methods=['GET', 'POST'])
 def editar_tema_regra(tr_id):
     """Edit a TemaRegra relationship."""
-    tema_regra = (
-        TemaRegra.query.options(
-            selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-            selectinload(TemaRegra.regra),
-            selectinload(TemaRegra.alternativa)
-            .selectinload(TemaRegra.tema)
-            .selectinload(Tema.jornada),
-            selectinload(TemaRegra.dias),
-        )
-        .filter_by(id=tr_id)
-        .first_or_404()
-    )
-    temas = (
-        Tema.query.options(selectinload(Tema.jornada))
-        .order_by(Tema.nome)
-        .all()
-    )
-    regras = Regra.query.order_by(Regra.descricao).all()
-    tema_regra_lista = (
-        TemaRegra.query.options(
-            selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-            selectinload(TemaRegra.regra),
-            selectinload(TemaRegra.alternativa)
-            .selectinload(TemaRegra.tema)
-            .selectinload(Tema.jornada),
-            selectinload(TemaRegra.alternativa).selectinload(TemaRegra.regra),
-        )
-        .order_by(TemaRegra.id)
-        .all()
-    )
-    tema_regra_opcoes = (
-        TemaRegra.query.options(
-            selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-            selectinload(TemaRegra.regra),
-        )
-        .filter(TemaRegra.id != tr_id)
-        .order_by(TemaRegra.id)
-        .all()
-    )
+    temas, regras, tema_regra_lista = _carregar_opcoes_tema_regra()
+    # A lista completa já contém o vínculo em edição e as opções de
+    # alternativa; filtrar em Python poupa duas consultas por GET.
+    tema_regra = next((tr for tr in tema_regra_lista if tr.id == tr_id), None)
+    if tema_regra is None:
+        abort(404)
+    tema_regra_opcoes = [tr for tr in tema_regra_lista if tr.id != tr_id]
     if request.method == 'POST':
         tema_id = int(request.form.get('tema_id'))
         regra_id = int(request.form.get('regra_id'))
-        tema_regra.tema = Tema.query.get(tema_id)
+        tema_regra.tema = db.session.get(Tema, tema_id)
         tema_regra.tema_id = tema_id
-        tema_regra.regra = Regra.query.get(regra_id)
+        tema_regra.regra = db.session.get(Regra, regra_id)
         tema_regra.regra_id = regra_id
         alternativa_id = request.form.get('alternativa_id') or None
         if alternativa_id:
             alternativa_id = int(alternativa_id)
-            # Evita ciclos ao selecionar como alternativa um vínculo
-            # que já depende deste registro.
-            corrente = TemaRegra.query.get(alternativa_id)
+            # Evita ciclos ao selecionar como alternativa um vínculo que já
+            # depende deste registro. Todos os vínculos já estão em memória,
+            # então o passeio usa um mapa id -> alternativa_id em vez de uma
+            # consulta por salto da cadeia.
+            alt_map = {tr.id: tr.alternativa_id for tr in tema_regra_lista}
             visitados = {tema_regra.id}
-            while corrente and corrente.alternativa_id:
-                if corrente.alternativa_id in visitados:
+            prox = alternativa_id
+            while prox:
+                if prox in visitados:
                     flash(
                         'A comunicação alternativa selecionada gera um ciclo. '
                         'Escolha outro vínculo.',
@@ -451,13 +456,33 @@ def editar_tema_regra(tr_id):
                         tema_regra=tema_regra,
                         tema_regra_opcoes=tema_regra_opcoes,
                     )
-                visitados.add(corrente.alternativa_id)
-                corrente = TemaRegra.query.get(corrente.alternativa_id)
+                visitados.add(prox)
+                prox = alt_map.get(prox)
         tema_regra.alternativa_id = alternativa_id
         db.session.flush()
-        for dia in tema_regra.dias:
-            _preencher_dia_por_tema_regra(dia, tema_regra)
+        # Propaga o snapshot para todos os dias do vínculo num único UPDATE,
+        # em vez de carregar cada DiaComunicacao e reescrevê-lo pelo ORM.
+        db.session.execute(
+            text(
+                """
+                UPDATE dias_comunicacoes AS d
+                SET tema_id = tr.tema_id,
+                    tema_nome = t.nome,
+                    regra_id = tr.regra_id,
+                    tema_id_alternativo = alt.tema_id,
+                    jornada_id = t.jornada_id,
+                    jornada_nome = j.nome
+                FROM temas_regras AS tr
+                JOIN temas AS t ON t.id = tr.tema_id
+                LEFT JOIN jornadas AS j ON j.id = t.jornada_id
+                LEFT JOIN temas_regras AS alt ON alt.id = tr.alternativa_id
+                WHERE tr.id = :tr_id AND d.tema_regra_id = :tr_id
+                """
+            ),
+            {'tr_id': tr_id},
+        )
         db.session.commit()
+        _invalidar_caches()
         flash('Vínculo Tema–Regra atualizado com sucesso!')
         return redirect(url_for('routes.home'))
     return render_template(
@@ -474,24 +499,56 @@ def editar_tema_regra(tr_id):
 @bp.route('/tema_regra/<int:tr_id>/deletar', methods=['POST'])
 def deletar_tema_regra(tr_id):
     """Delete a TemaRegra and cascade delete its Dias."""
-    tema_regra = TemaRegra.query.get_or_404(tr_id)
-    _limpar_dependencias_tema_regra(tema_regra)
-    db.session.delete(tema_regra)
+    _deletar_ou_404(TemaRegra, tr_id)
     db.session.commit()
+    _invalidar_caches()
     flash('Vínculo Tema–Regra deletado com sucesso!')
     return redirect(url_for('routes.home'))
 
 
+# Linhas por lote de INSERT: mantém cada executemany num statement preparado
+# de tamanho comportado para o SQLite.
+_TAMANHO_LOTE_DIAS = 400
+
+
+def _bulk_add_dias(tr_id: int, valores: list[int]) -> int:
+    """Insere vários dias de comunicação para um vínculo, em lotes.
+
+    Cada lote é um único INSERT ... SELECT executado em estilo executemany:
+    a cópia do snapshot do vínculo acontece dentro do SQLite, sem SELECT
+    prévio do TemaRegra nem hidratação ORM, tudo na mesma transação do
+    chamador. Retorna o total de linhas inseridas (0 se o vínculo não
+    existe).
+    """
+
+    comando = text(
+        """
+        INSERT INTO dias_comunicacoes
+            (dia, tema_regra_id, tema_id, tema_nome, regra_id,
+             tema_id_alternativo, jornada_id, jornada_nome)
+        SELECT :dia, tr.id, tr.tema_id, t.nome, tr.regra_id,
+               alt.tema_id, t.jornada_id, j.nome
+        FROM temas_regras AS tr
+        JOIN temas AS t ON t.id = tr.tema_id
+        LEFT JOIN jornadas AS j ON j.id = t.jornada_id
+        LEFT JOIN temas_regras AS alt ON alt.id = tr.alternativa_id
+        WHERE tr.id = :tr_id
+        """
+    )
+    inseridos = 0
+    for inicio in range(0, len(valores), _TAMANHO_LOTE_DIAS):
+        lote = valores[inicio:inicio + _TAMANHO_LOTE_DIAS]
+        resultado = db.session.execute(
+            comando,
+            [{'dia': valor, 'tr_id': tr_id} for valor in lote],
+        )
+        inseridos += resultado.rowcount
+    return inseridos
+
+
 @bp.route('/dia/novo', methods=['GET', 'POST'])
 def novo_dia():
-    tema_regras = (
-        TemaRegra.query.options(
-            selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-            selectinload(TemaRegra.regra),
-        )
-        .order_by(TemaRegra.id)
-        .all()
-    )
+    tema_regras = _opcoes_tema_regra_dropdown()
     dias_existentes = (
         DiaComunicacao.query.options(
             selectinload(DiaComunicacao.tema_regra)
@@ -503,36 +560,22 @@ def novo_dia():
         .all()
     )
     if request.method == 'POST':
-        dia = int(request.form['dia'])
+        # Aceita um único dia ou vários separados por vírgula (ex.: "0,7,30").
+        valores = [
+            int(parte)
+            for parte in request.form['dia'].split(',')
+            if parte.strip()
+        ]
         tr_id = int(request.form['tr_id'])
-        tr = (
-            TemaRegra.query.options(
-                selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-                selectinload(TemaRegra.regra),
-                selectinload(TemaRegra.alternativa)
-                .selectinload(TemaRegra.tema)
-                .selectinload(Tema.jornada),
-            )
-            .filter_by(id=tr_id)
-            .first_or_404()
-        )
-        # cria o registro copiando os dados do vínculo
-        jornada_id, jornada_nome = _obter_jornada_info(tr.tema)
-        dc = DiaComunicacao(
-            dia=dia,
-            tema_regra_id=tr_id,
-            tema_id=tr.tema_id,
-            tema_nome=tr.tema.nome,
-            regra_id=tr.regra_id,
-            tema_id_alternativo=(
-                tr.alternativa.tema_id if getattr(tr, 'alternativa', None) else None
-            ),
-            jornada_id=jornada_id,
-            jornada_nome=jornada_nome,
-        )
-        db.session.add(dc)
+        if not valores or _bulk_add_dias(tr_id, valores) == 0:
+            db.session.rollback()
+            abort(404)
         db.session.commit()
-        flash('Dia de comunicação adicionado com sucesso!')
+        _invalidar_caches()
+        if len(valores) > 1:
+            flash(f'{len(valores)} dias de comunicação adicionados com sucesso!')
+        else:
+            flash('Dia de comunicação adicionado com sucesso!')
         return redirect(url_for('routes.home'))
     return render_template(
         'dia_form.html',
@@ -545,15 +588,8 @@ def novo_dia():
 @bp.route('/dia/<int:dia_id>/editar', methods=['GET', 'POST'])
 def editar_dia(dia_id):
     """Edit an existing DiaComunicacao."""
-    dia = DiaComunicacao.query.get_or_404(dia_id)
-    tema_regras = (
-        TemaRegra.query.options(
-            selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-            selectinload(TemaRegra.regra),
-        )
-        .order_by(TemaRegra.id)
-        .all()
-    )
+    dia = _get_or_404(DiaComunicacao, dia_id)
+    tema_regras = _opcoes_tema_regra_dropdown()
     dias_existentes = (
         DiaComunicacao.query.options(
             selectinload(DiaComunicacao.tema_regra)
@@ -581,6 +617,7 @@ def editar_dia(dia_id):
         dia.tema_regra_id = novo_tr_id
         _preencher_dia_por_tema_regra(dia, tema_regra)
         db.session.commit()
+        _invalidar_caches()
         flash('Dia atualizado com sucesso!')
         return redirect(url_for('routes.home'))
     return render_template(
@@ -594,46 +631,207 @@ def editar_dia(dia_id):
 @bp.route('/dia/<int:dia_id>/deletar', methods=['POST'])
 def deletar_dia(dia_id):
     """Delete a DiaComunicacao."""
-    dia = DiaComunicacao.query.get_or_404(dia_id)
-    db.session.delete(dia)
+    _deletar_ou_404(DiaComunicacao, dia_id)
     db.session.commit()
+    _invalidar_caches()
     flash('Dia de comunicação deletado com sucesso!')
     return redirect(url_for('routes.home'))
 
+def _versao_dados() -> int:
+    """Lê o PRAGMA data_version, que muda quando outra conexão grava no banco.
+
+    Escritas da própria conexão não mexem no contador, mas essas passam pelas
+    rotas deste processo, que chamam ``_invalidar_caches()``. Os dois
+    mecanismos juntos cobrem tanto o escritor local quanto workers vizinhos
+    num deploy multi-processo (``gunicorn -w N``), ao custo de um PRAGMA de
+    leitura por consulta ao cache.
+    """
+
+    return db.session.execute(text('PRAGMA data_version')).scalar()
+
+
+# Cache em processo do diagrama Mermaid. A chave é uma impressão digital
+# barata dos dados; qualquer rota de escrita invalida explicitamente, então
+# visitas repetidas a /uml custam apenas a devolução da string pronta.
+_cache_diagrama: dict[str, object] = {'chave': None, 'valor': None, 'etag': None}
+
+
+# Opções do dropdown de vínculos dos formulários de dia: linhas leves
+# (id + rótulos prontos) carregadas uma vez e reaproveitadas entre GETs,
+# em vez de hidratar todos os TemaRegra a cada renderização. A versão guarda
+# o data_version da carga, para recarregar se outro processo gravar no banco.
+_cache_opcoes_tr: dict[str, object] = {'versao': None, 'valor': None}
+
+
+# Idem para os dropdowns de tema e regra dos formulários de vínculo: dados de
+# referência que mudam raramente, servidos como linhas leves entre escritas.
+_cache_opcoes_ref: dict[str, object] = {'versao': None, 'temas': None, 'regras': None}
+
+
+def _invalidar_caches() -> None:
+    """Descarta os dados memorizados após qualquer escrita relevante."""
+
+    _cache_diagrama['chave'] = None
+    _cache_diagrama['valor'] = None
+    _cache_diagrama['etag'] = None
+    _cache_opcoes_tr['valor'] = None
+    _cache_opcoes_ref['temas'] = None
+    _cache_opcoes_ref['regras'] = None
+
+
+def _opcoes_ref_validadas() -> dict:
+    """Descarta as linhas de referência se outra conexão gravou no banco."""
+
+    versao = _versao_dados()
+    if _cache_opcoes_ref['versao'] != versao:
+        _cache_opcoes_ref.update(versao=versao, temas=None, regras=None)
+    return _cache_opcoes_ref
+
+
+def _opcoes_temas_dropdown():
+    """Retorna (id, nome, jornada_nome) por tema, em ordem alfabética."""
+
+    cache = _opcoes_ref_validadas()
+    valor = cache['temas']
+    if valor is None:
+        valor = db.session.execute(
+            select(Tema.id, Tema.nome, Jornada.nome.label('jornada_nome'))
+            .outerjoin(Jornada, Jornada.id == Tema.jornada_id)
+            .order_by(Tema.nome)
+        ).all()
+        cache['temas'] = valor
+    return valor
+
+
+def _opcoes_regras_dropdown():
+    """Retorna (id, descricao) por regra, em ordem alfabética."""
+
+    cache = _opcoes_ref_validadas()
+    valor = cache['regras']
+    if valor is None:
+        valor = db.session.execute(
+            select(Regra.id, Regra.descricao).order_by(Regra.descricao)
+        ).all()
+        cache['regras'] = valor
+    return valor
+
+
+def _opcoes_tema_regra_dropdown():
+    """Retorna (id, tema_nome, jornada_nome, regra_descricao) por vínculo."""
+
+    versao = _versao_dados()
+    valor = _cache_opcoes_tr['valor']
+    if valor is None or _cache_opcoes_tr['versao'] != versao:
+        valor = db.session.execute(
+            text(
+                """
+                SELECT tr.id,
+                       t.nome AS tema_nome,
+                       j.nome AS jornada_nome,
+                       r.descricao AS regra_descricao
+                FROM temas_regras AS tr
+                JOIN temas AS t ON t.id = tr.tema_id
+                LEFT JOIN jornadas AS j ON j.id = t.jornada_id
+                JOIN regras AS r ON r.id = tr.regra_id
+                ORDER BY tr.id
+                """
+            )
+        ).all()
+        _cache_opcoes_tr['valor'] = valor
+        _cache_opcoes_tr['versao'] = versao
+    return valor
+
+
+def _chave_diagrama() -> tuple:
+    """Impressão digital barata dos dados que alimentam o diagrama.
+
+    Cobre dias e vínculos (máximo de id + contagem de cada tabela), de modo
+    que criações e exclusões mudam a chave por si sós. Edições que preservam
+    ids são cobertas pela invalidação explícita nas rotas de escrita deste
+    processo e, vindas de outros processos, pelo data_version embutido na
+    chave — sem ele, um worker vizinho serviria o diagrama (e o ETag) velho
+    para sempre após um rename.
+    """
+
+    dias = db.session.query(
+        func.max(DiaComunicacao.id),
+        func.count(DiaComunicacao.id),
+    ).one()
+    vinculos = db.session.query(
+        func.max(TemaRegra.id),
+        func.count(TemaRegra.id),
+    ).one()
+    return (_versao_dados(),) + tuple(dias) + tuple(vinculos)
+
+
 def gerar_diagrama_mermaid() -> str:
-    """Monta o código Mermaid (flowchart LR) com cadeia de alternativas."""
-    from sqlalchemy.orm import selectinload
+    """Retorna o código Mermaid completo, memorizado em processo.
+
+    O resultado só é reconstruído quando a impressão digital dos dados muda
+    ou uma rota de escrita invalida o cache.
+    """
+
+    chave = _chave_diagrama()
+    if _cache_diagrama['chave'] == chave:
+        return _cache_diagrama['valor']
+
+    diagrama = "\n".join(_montar_linhas_mermaid())
+    _cache_diagrama['chave'] = chave
+    _cache_diagrama['valor'] = diagrama
+    _cache_diagrama['etag'] = hashlib.md5(diagrama.encode()).hexdigest()
+    return diagrama
+
+
+def _montar_linhas_mermaid() -> list[str]:
+    """Monta as linhas do diagrama Mermaid (flowchart LR) com cadeia de alternativas."""
 
-    # Todos os vínculos Tema–Regra para facilitar a navegação pelas alternativas
+    # O diagrama só precisa de colunas escalares; selects de colunas do Core
+    # devolvem tuplas nomeadas sem hidratar objetos ORM nem acionar a
+    # maquinaria de relacionamentos — todos os dados chegam em duas queries.
     tema_regra_map = {
-        tr.id: tr
-        for tr in (
-            TemaRegra.query.options(
-                selectinload(TemaRegra.tema).selectinload(Tema.jornada),
-                selectinload(TemaRegra.regra),
-            ).all()
+        linha.id: linha
+        for linha in db.session.execute(
+            select(
+                TemaRegra.id,
+                TemaRegra.alternativa_id,
+                Tema.nome.label('tema_nome'),
+                Tema.jornada_id,
+                Jornada.nome.label('jornada_nome'),
+                Regra.descricao.label('regra_descricao'),
+            )
+            .select_from(TemaRegra)
+            .outerjoin(Tema, Tema.id == TemaRegra.tema_id)
+            .outerjoin(Jornada, Jornada.id == Tema.jornada_id)
+            .outerjoin(Regra, Regra.id == TemaRegra.regra_id)
         )
     }
 
-    dias = (
-        DiaComunicacao.query.options(
-            selectinload(DiaComunicacao.tema_regra)
-            .selectinload(TemaRegra.tema)
-            .selectinload(Tema.jornada)
+    dias = db.session.execute(
+        select(
+            DiaComunicacao.dia,
+            DiaComunicacao.tema_regra_id,
+            func.coalesce(
+                func.nullif(func.trim(DiaComunicacao.tema_nome), ''),
+                Tema.nome,
+                'Tema',
+            ).label('tema_nome'),
+            DiaComunicacao.jornada_id,
+            DiaComunicacao.jornada_nome,
         )
+        .outerjoin(TemaRegra, TemaRegra.id == DiaComunicacao.tema_regra_id)
+        .outerjoin(Tema, Tema.id == TemaRegra.tema_id)
         .order_by(DiaComunicacao.dia, DiaComunicacao.id)
-        .all()
-    )
-
-    por_dia = {}
-    for d in dias:
-        por_dia.setdefault(d.dia, []).append(d)
+    ).all()
 
-    ordered_days = sorted(por_dia.keys())
+    # A consulta já devolve ORDER BY dia, id, então um groupby agrupa em uma
+    # única passada, sem dicionário intermediário nem re-sort das chaves.
+    grupos_por_dia = [
+        (dia, list(registros)) for dia, registros in groupby(dias, key=lambda d: d.dia)
+    ]
+    ordered_days = [dia for dia, _ in grupos_por_dia]
 
     fim_dia_valor = 99999
     fim_node_id = f"D{fim_dia_valor}"
-    day_nodes = []
     decision_nodes = []
     journey_node_assignments: set[tuple[str, str]] = set()
     journey_styles: dict[str | int | None, dict[str, str]] = {}
@@ -659,7 +857,7 @@ def gerar_diagrama_mermaid() -> str:
             "    classDef dia fill:#FFF3CD,stroke:#C77D00,stroke-width:2px,rx:8,ry:8;",
             f"    class {fim_node_id} dia",
         ]
-        return "\n".join(lines)
+        return lines
 
     def sanitize(texto: str, default: str) -> str:
         texto = (texto or '').strip()
@@ -688,6 +886,33 @@ def gerar_diagrama_mermaid() -> str:
                 corrente = None
         return cadeia
 
+    # Os rótulos derivados de um TemaRegra não variam entre os dias em que o
+    # vínculo aparece; memorizar por id evita repetir sanitize() e os acessos
+    # a tema/regra a cada ocorrência em réguas grandes.
+    rotulos_por_tr: dict[int, tuple] = {}
+
+    def rotulos_tema_regra(etapa):
+        rotulo = rotulos_por_tr.get(etapa.id)
+        if rotulo is None:
+            tema_label = (
+                sanitize(etapa.tema_nome, 'Tema')
+                if etapa.tema_nome is not None
+                else None
+            )
+            regra_label = sanitize(etapa.regra_descricao or '', '')
+            has_rule = bool(regra_label) and regra_label.lower() not in {
+                'sem regra',
+            }
+            rotulo = (
+                tema_label,
+                etapa.jornada_id,
+                etapa.jornada_nome,
+                has_rule,
+                regra_para_decisao(regra_label) if has_rule else None,
+            )
+            rotulos_por_tr[etapa.id] = rotulo
+        return rotulo
+
     def registrar_jornada(jornada_id: int | None, jornada_nome: str | None) -> dict[str, str]:
         nonlocal palette_index
 
@@ -718,61 +943,67 @@ def gerar_diagrama_mermaid() -> str:
 
     lines = ["flowchart LR"]
 
-    for n in ordered_days:
-        node_id = f'D{n}'
-        lines.append(f'    {node_id}["Dia {n}"]:::dia')
-        day_nodes.append(node_id)
+    # Blocos homogêneos saem em extend com geradores: menos despachos de
+    # append por nó/aresta no laço mais quente do gerador de diagrama.
+    lines.extend(f'    D{n}["Dia {n}"]:::dia' for n in ordered_days)
+    day_nodes = [f'D{n}' for n in ordered_days]
 
     lines.append(f'    {fim_node_id}["Fim"]:::dia')
     day_nodes.append(fim_node_id)
 
-    for i in range(len(ordered_days) - 1):
-        a, b = ordered_days[i], ordered_days[i + 1]
-        lines.append(f'    D{a} --> D{b}')
-
-    if ordered_days:
-        lines.append(f'    D{ordered_days[-1]} --> {fim_node_id}')
+    lines.extend(
+        f'    D{a} --> D{b}' for a, b in zip(ordered_days, ordered_days[1:])
+    )
+    # ordered_days nunca é vazio aqui: o caso sem dias retorna mais acima.
+    lines.append(f'    D{ordered_days[-1]} --> {fim_node_id}')
+
+    # Aliases locais cortam a resolução de atributo repetida nos laços mais
+    # quentes abaixo.
+    lines_append = lines.append
+    decision_nodes_append = decision_nodes.append
+
+    # Cadeia de alternativas já rotulada, memorizada por vínculo raiz: um
+    # vínculo presente em K dias tem o passeio e a sanitização feitos uma vez;
+    # por ocorrência restam só os ids de nó e o fallback de jornada.
+    cadeia_cache: dict[int, list[tuple]] = {}
+
+    def cadeia_rotulada(tr_id):
+        cadeia_info = cadeia_cache.get(tr_id)
+        if cadeia_info is None:
+            tema_regra = tema_regra_map.get(tr_id)
+            cadeia_info = (
+                [rotulos_tema_regra(etapa) for etapa in cadeia_alternativas(tema_regra)]
+                if tema_regra
+                else []
+            )
+            cadeia_cache[tr_id] = cadeia_info
+        return cadeia_info
 
-    for dia_valor in ordered_days:
-        blocos = por_dia[dia_valor]
+    for dia_valor, blocos in grupos_por_dia:
         for idx, registro in enumerate(blocos, start=1):
-            tema_regra = tema_regra_map.get(registro.tema_regra_id)
-            if not tema_regra:
-                continue
-
-            cadeia = cadeia_alternativas(tema_regra)
-            if not cadeia:
+            cadeia_info = cadeia_rotulada(registro.tema_regra_id)
+            if not cadeia_info:
                 continue
 
             etapas = []
-            for nivel, etapa in enumerate(cadeia):
-                tema_label = sanitize(
-                    etapa.tema.nome if etapa.tema else registro.tema_nome,
-                    'Tema',
-                )
-                jornada_obj = (
-                    etapa.tema.jornada
-                    if etapa.tema and getattr(etapa.tema, 'jornada', None)
-                    else None
-                )
-                jornada_id = (
-                    jornada_obj.id
-                    if jornada_obj is not None
-                    else (registro.jornada_id if registro.jornada_id else None)
-                )
-                jornada_nome = (
-                    jornada_obj.nome
-                    if jornada_obj is not None
-                    else registro.jornada_nome
-                )
+            for nivel, (
+                tema_label,
+                tr_jornada_id,
+                tr_jornada_nome,
+                has_rule,
+                decisao,
+            ) in enumerate(cadeia_info):
+                if tema_label is None:
+                    # O COALESCE da consulta já resolveu a cadeia de
+                    # fallback (snapshot -> tema atual -> 'Tema').
+                    tema_label = sanitize(registro.tema_nome, 'Tema')
+                if tr_jornada_id is not None:
+                    jornada_id = tr_jornada_id
+                    jornada_nome = tr_jornada_nome
+                else:
+                    jornada_id = registro.jornada_id if registro.jornada_id else None
+                    jornada_nome = registro.jornada_nome
                 journey_info = registrar_jornada(jornada_id, jornada_nome)
-                regra_label = sanitize(
-                    etapa.regra.descricao if etapa.regra else '',
-                    '',
-                )
-                has_rule = bool(regra_label) and regra_label.lower() not in {
-                    'sem regra',
-                }
                 entry_id = f'ST{dia_valor}_{idx}_{nivel}_ENTRY'
                 msg_id = f'ST{dia_valor}_{idx}_{nivel}_MSG'
                 if not has_rule:
@@ -783,39 +1014,36 @@ def gerar_diagrama_mermaid() -> str:
                         'entry_id': entry_id,
                         'msg_id': msg_id,
                         'tema': tema_label,
-                        'regra': regra_label,
+                        'decisao': decisao,
                         'has_rule': has_rule,
                         'journey_class': journey_info['class_name'],
                     }
                 )
 
             for etapa in etapas:
+                msg_id = etapa['msg_id']
                 if etapa['has_rule']:
-                    entry_id = etapa["entry_id"]
-                    lines.append(
-                        f'    {entry_id}{{"{regra_para_decisao(etapa["regra"])}"}}'
-                    )
-                    decision_nodes.append(entry_id)
-                lines.append(f'    {etapa["msg_id"]}["{etapa["tema"]}"]')
-                journey_node_assignments.add(
-                    (etapa['msg_id'], etapa['journey_class'])
-                )
+                    entry_id = etapa['entry_id']
+                    lines_append(f'    {entry_id}{{"{etapa["decisao"]}"}}')
+                    decision_nodes_append(entry_id)
+                lines_append(f'    {msg_id}["{etapa["tema"]}"]')
+                journey_node_assignments.add((msg_id, etapa['journey_class']))
 
             for pos, etapa in enumerate(etapas):
                 entry_id = etapa['entry_id']
                 msg_id = etapa['msg_id']
                 if etapa['has_rule']:
                     if pos == 0:
-                        lines.append(f'    D{dia_valor} --> {entry_id}')
-                    lines.append(f'    {entry_id} -->|Sim| {msg_id}')
+                        lines_append(f'    D{dia_valor} --> {entry_id}')
+                    lines_append(f'    {entry_id} -->|Sim| {msg_id}')
                     if pos < len(etapas) - 1:
                         prox_entry = etapas[pos + 1]['entry_id']
-                        lines.append(f'    {entry_id} -->|Não| {prox_entry}')
+                        lines_append(f'    {entry_id} -->|Não| {prox_entry}')
                     else:
-                        lines.append(f'    {entry_id} -->|Não| {msg_id}')
+                        lines_append(f'    {entry_id} -->|Não| {msg_id}')
                 else:
                     if pos == 0:
-                        lines.append(f'    D{dia_valor} --> {msg_id}')
+                        lines_append(f'    D{dia_valor} --> {msg_id}')
 
     if journey_styles:
         for info in journey_styles.values():
@@ -845,15 +1073,33 @@ def gerar_diagrama_mermaid() -> str:
         for node_id, class_name in legend_nodes:
             lines.append(f'    class {node_id} {class_name}')
 
-    return "\n".join(lines)
+    return lines
+
 
+def _etag_diagrama() -> str:
+    """ETag forte derivada do conteúdo corrente do diagrama.
 
+    Derivar do conteúdo (e não da impressão digital) garante que edições que
+    preservam ids — renomear um tema, por exemplo — também mudem o ETag. Com
+    o cache quente, devolver o valor custa só a checagem da impressão
+    digital; um cliente que reenvia o ETag recebe 304 sem render algum.
+    """
+
+    gerar_diagrama_mermaid()
+    return _cache_diagrama['etag']
 
 
 @bp.route('/uml')
 def uml():
-    mermaid_code = gerar_diagrama_mermaid()
-    return render_template('uml.html', mermaid_code=mermaid_code)
+    etag = _etag_diagrama()
+    if request.if_none_match.contains(etag):
+        return Response(status=304)
+    resp = make_response(
+        render_template('uml.html', mermaid_code=gerar_diagrama_mermaid())
+    )
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'private, must-revalidate'
+    return resp
 
 
 @bp.route('/uml/download')
@@ -863,7 +1109,25 @@ def download_uml():
     Hoje o PDF é gerado no navegador (sem depender do servidor).
     Esta rota retorna o código Mermaid atual como texto, caso alguém queira exportar.
     """
-    codigo = gerar_diagrama_mermaid()
-    resp = Response(codigo, mimetype='text/plain; charset=utf-8')
+
+    etag = _etag_diagrama()
+    if request.if_none_match.contains(etag):
+        return Response(status=304)
+
+    def transmitir():
+        # Com cache quente devolve a string pronta; frio, emite linha a
+        # linha sem materializar o diagrama inteiro numa segunda string.
+        if _cache_diagrama['chave'] == _chave_diagrama():
+            yield _cache_diagrama['valor']
+            return
+        for indice, linha in enumerate(_montar_linhas_mermaid()):
+            yield linha if indice == 0 else '\n' + linha
+
+    resp = Response(
+        stream_with_context(transmitir()),
+        mimetype='text/plain; charset=utf-8',
+    )
     resp.headers['Content-Disposition'] = 'attachment; filename=diagrama_uml.mmd'
+    resp.set_etag(etag)
+    resp.headers['Cache-Control'] = 'private, must-revalidate'
     return resp
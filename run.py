@@ -1,14 +1,18 @@
 """Convenience script to run the CRM communication ruler application.
 
 This script imports the application factory from the `regua_app` package
-and runs it with debug mode enabled.  Use `python run.py` to start the
-development server.  When deploying to production, configure a proper
-WSGI server and disable debug.
+and runs the development server.  Use `python run.py` to start it; set
+`FLASK_DEBUG=1` to enable the interactive debugger and the auto-reloader.
+Debug mode is off by default because it disables template caching and
+stats every source file per request.  When deploying to production, use
+a proper WSGI server instead (see `wsgi.py`).
 """
 
+import os
+
 from regua_app import create_app
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=os.getenv('FLASK_DEBUG') == '1')
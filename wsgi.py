@@ -0,0 +1,13 @@
+"""Production WSGI entrypoint for the CRM communication ruler application.
+
+Run with gunicorn (already listed in `requirements.txt`):
+
+    gunicorn -w 4 wsgi:application
+
+Debug mode stays off here, so the Jinja bytecode cache and template
+caching are fully effective and no reloader watches the filesystem.
+"""
+
+from regua_app import create_app
+
+application = create_app()